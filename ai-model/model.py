@@ -5,14 +5,15 @@
 # """
 
 # import os
+# from concurrent.futures import ThreadPoolExecutor
 # import numpy as np
 # import tensorflow as tf
 # from tensorflow import keras
 # from tensorflow.keras import layers
-# from tensorflow.keras.preprocessing.image import ImageDataGenerator
 # import cv2
-# from PIL import Image
-# import json
+# import onnxruntime as ort
+# import tf2onnx
+# import orjson
 # from typing import Dict, List, Tuple
 # import logging
 
@@ -20,11 +21,23 @@
 # logging.basicConfig(level=logging.INFO)
 # logger = logging.getLogger(__name__)
 
+# # TensorRT engines are built per input shape; cache them across restarts
+# TRT_ENGINE_CACHE_DIR = os.getenv('TRT_ENGINE_CACHE_DIR', 'models/trt_cache')
+
+# # Mixed precision only pays off on GPUs with tensor cores; keep FP32 on CPU.
+# # It applies to training only: the serving copy is always rebuilt in float32.
+# if tf.config.list_physical_devices('GPU'):
+#     tf.keras.mixed_precision.set_global_policy('mixed_float16')
+
 # class CropDiseaseModel:
 #     """Crop Disease Detection Model Class"""
 
 #     def __init__(self, model_path: str = None):
 #         self.model = None
+#         self.sess = None
+#         self.input_name = None
+#         # OpenCV releases the GIL while decoding, so images are loaded in parallel
+#         self.decode_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
 #         self.class_names = [
 #             'Apple___Apple_scab',
 #             'Apple___Black_rot',
@@ -81,99 +94,245 @@
 #             layers.Flatten(),
 #             layers.Dense(128, activation='relu'),
 #             layers.Dropout(0.5),
-#             layers.Dense(len(self.class_names), activation='softmax')
+#             # Softmax stays in float32 for a numerically stable loss
+#             layers.Dense(len(self.class_names), activation='softmax', dtype='float32')
 #         ])
 
+#         optimizer = keras.optimizers.Adam()
+#         if keras.mixed_precision.global_policy().name == 'mixed_float16':
+#             optimizer = keras.mixed_precision.LossScaleOptimizer(optimizer)
+
+#         # XLA fuses the Conv2D/BiasAdd/ReLU chains into single kernels
 #         self.model.compile(
-#             optimizer='adam',
+#             optimizer=optimizer,
 #             loss='categorical_crossentropy',
-#             metrics=['accuracy']
+#             metrics=['accuracy'],
+#             jit_compile=True
 #         )
 
 #         logger.info("Model built successfully")
+#         self._init_session()
 
-#     def train(self, train_dir: str, validation_dir: str, epochs: int = 10):
-#         """Train the model"""
-#         logger.info("Starting model training...")
+#     def _serving_model(self) -> keras.Model:
+#         """Float32 inference copy of the model with the Dropout layers stripped
 
-#         # Data augmentation for training
-#         train_datagen = ImageDataGenerator(
-#             rescale=1./255,
-#             rotation_range=20,
-#             width_shift_range=0.2,
-#             height_shift_range=0.2,
-#             shear_range=0.2,
-#             zoom_range=0.2,
-#             horizontal_flip=True,
-#             fill_mode='nearest'
+#         The layers are rebuilt under a float32 policy even when training uses
+#         mixed_float16, so the exported ONNX graph runs on every execution
+#         provider; FP16 is left to TensorRT (trt_fp16_enable).
+#         """
+#         trained = [layer for layer in self.model.layers if not isinstance(layer, layers.Dropout)]
+
+#         serving_layers = []
+#         for layer in trained:
+#             config = layer.get_config()
+#             config['dtype'] = 'float32'
+#             config.pop('batch_input_shape', None)
+#             serving_layers.append(layer.__class__.from_config(config))
+
+#         serving = keras.Sequential([keras.Input(shape=(224, 224, 3))] + serving_layers)
+#         for source, target in zip(trained, serving_layers):
+#             target.set_weights(source.get_weights())
+#         return serving
+
+#     def _to_onnx(self, output_path: str = None):
+#         """Convert the serving model to ONNX, optionally writing it to a file"""
+#         input_signature = (tf.TensorSpec((None, 224, 224, 3), tf.float32, name='input'),)
+#         onnx_model, _ = tf2onnx.convert.from_keras(
+#             self._serving_model(), input_signature=input_signature, output_path=output_path
 #         )
+#         return onnx_model
 
-#         # Only rescaling for validation
-#         validation_datagen = ImageDataGenerator(rescale=1./255)
+#     @staticmethod
+#     def _execution_providers() -> List:
+#         """Fastest available ONNX Runtime execution providers, in priority order"""
+#         preferred = [
+#             ('TensorrtExecutionProvider', {
+#                 'trt_fp16_enable': True,
+#                 'trt_engine_cache_enable': True,
+#                 'trt_engine_cache_path': TRT_ENGINE_CACHE_DIR
+#             }),
+#             'CUDAExecutionProvider',
+#             'CPUExecutionProvider'
+#         ]
+#         available = ort.get_available_providers()
+#         return [p for p in preferred if (p[0] if isinstance(p, tuple) else p) in available]
 
-#         train_generator = train_datagen.flow_from_directory(
+#     def _init_session(self, onnx_path: str = None):
+#         """Open a persistent inference session from an ONNX file or the in-memory model"""
+#         if onnx_path:
+#             model_source = onnx_path
+#         else:
+#             model_source = self._to_onnx().SerializeToString()
+
+#         sess_options = ort.SessionOptions()
+#         sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+#         sess_options.enable_mem_pattern = True
+
+#         self.sess = ort.InferenceSession(
+#             model_source, sess_options=sess_options, providers=self._execution_providers()
+#         )
+#         self.input_name = self.sess.get_inputs()[0].name
+#         logger.info(f"Inference session ready ({', '.join(self.sess.get_providers())})")
+
+#     @staticmethod
+#     def _to_uint8(image, label):
+#         """Store pixels as uint8, a quarter of the float32 size, before caching"""
+#         return tf.saturate_cast(tf.round(image), tf.uint8), label
+
+#     @staticmethod
+#     def _rescale(image, label):
+#         """Scale pixel values to [0, 1]"""
+#         return tf.cast(image, tf.float32) / 255.0, label
+
+#     @staticmethod
+#     def _augment(image, label):
+#         """Random flip, rotation and crop, run as tf.image ops inside the pipeline"""
+#         image = tf.image.random_flip_left_right(image)
+#         image = tf.image.rot90(image, k=tf.random.uniform([], minval=0, maxval=4, dtype=tf.int32))
+#         image = tf.image.resize(image, (256, 256))
+#         image = tf.image.random_crop(image, size=(224, 224, 3))
+#         return image, label
+
+#     def train(self, train_dir: str, validation_dir: str, epochs: int = 10):
+#         """Train the model"""
+#         logger.info("Starting model training...")
+
+#         # Decode once, cache in memory as uint8, then rescale, augment and batch on the fly
+#         train_ds = keras.utils.image_dataset_from_directory(
 #             train_dir,
-#             target_size=(224, 224),
-#             batch_size=32,
-#             class_mode='categorical'
+#             image_size=(224, 224),
+#             batch_size=None,
+#             label_mode='categorical'
+#         )
+#         train_ds = (
+#             train_ds
+#             .map(self._to_uint8, num_parallel_calls=tf.data.AUTOTUNE)
+#             .cache()
+#             .shuffle(1000)
+#             .map(self._rescale, num_parallel_calls=tf.data.AUTOTUNE)
+#             .map(self._augment, num_parallel_calls=tf.data.AUTOTUNE)
+#             .batch(32)
+#             .prefetch(tf.data.AUTOTUNE)
 #         )
 
-#         validation_generator = validation_datagen.flow_from_directory(
+#         # Only rescaling for validation
+#         validation_ds = keras.utils.image_dataset_from_directory(
 #             validation_dir,
-#             target_size=(224, 224),
+#             image_size=(224, 224),
 #             batch_size=32,
-#             class_mode='categorical'
+#             label_mode='categorical',
+#             shuffle=False
 #         )
+#         validation_ds = (
+#             validation_ds
+#             .map(self._to_uint8, num_parallel_calls=tf.data.AUTOTUNE)
+#             .cache()
+#             .map(self._rescale, num_parallel_calls=tf.data.AUTOTUNE)
+#             .prefetch(tf.data.AUTOTUNE)
+#         )
+
+#         options = tf.data.Options()
+#         options.deterministic = False
+#         options.threading.private_threadpool_size = 0
+#         train_ds = train_ds.with_options(options)
+#         validation_ds = validation_ds.with_options(options)
 
 #         # Train the model
 #         history = self.model.fit(
-#             train_generator,
+#             train_ds,
 #             epochs=epochs,
-#             validation_data=validation_generator
+#             validation_data=validation_ds
 #         )
 
 #         logger.info("Training completed")
+#         self._init_session()
 #         return history
 
-#     def predict(self, image_path: str) -> Dict:
-#         """Predict disease from image"""
+#     def _load_image(self, image_path: str) -> np.ndarray:
+#         """Decode an image into a 224x224 RGB uint8 array"""
+#         img = cv2.imread(image_path, cv2.IMREAD_COLOR)
+#         if img is None:
+#             raise ValueError(f"Could not read image: {image_path}")
+#         img = cv2.resize(img, (224, 224), interpolation=cv2.INTER_AREA)
+#         return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+#     def predict_batch(self, image_paths: List[str], top_k: int = 1, return_all: bool = False) -> List[Dict]:
+#         """Predict diseases for a batch of images with a single session run
+
+#         Only the top-1 class is returned by default; ``top_k`` adds a ranked
+#         ``top_predictions`` list and ``return_all`` the raw ``scores`` array,
+#         indexed like ``class_names``.
+#         """
 #         try:
-#             # Load and preprocess image
-#             img = Image.open(image_path)
-#             img = img.resize((224, 224))
-#             img_array = np.array(img) / 255.0
-#             img_array = np.expand_dims(img_array, axis=0)
-
-#             # Make prediction
-#             predictions = self.model.predict(img_array)
-#             predicted_class = np.argmax(predictions[0])
-#             confidence = float(predictions[0][predicted_class])
-
-#             result = {
-#                 'disease': self.class_names[predicted_class],
-#                 'confidence': confidence,
-#                 'predictions': {
-#                     self.class_names[i]: float(predictions[0][i])
-#                     for i in range(len(self.class_names))
+#             batch = np.empty((len(image_paths), 224, 224, 3), dtype=np.float32)
+#             for i, img in enumerate(self.decode_pool.map(self._load_image, image_paths)):
+#                 batch[i] = img
+
+#             # Rescale in place, in float32
+#             np.multiply(batch, np.float32(1.0 / 255.0), out=batch)
+
+#             # One session run for the whole batch
+#             predictions = self.sess.run(None, {self.input_name: batch})[0]
+
+#             # Top-k classes per image, ranked by score
+#             k = max(1, min(top_k, len(self.class_names)))
+#             top_classes = np.argpartition(-predictions, k - 1, axis=1)[:, :k]
+#             order = np.argsort(-np.take_along_axis(predictions, top_classes, axis=1), axis=1)
+#             top_classes = np.take_along_axis(top_classes, order, axis=1)
+
+#             results = []
+#             for scores, classes in zip(predictions, top_classes):
+#                 result = {
+#                     'disease': self.class_names[classes[0]],
+#                     'confidence': float(scores[classes[0]])
 #                 }
-#             }
+#                 if k > 1:
+#                     result['top_predictions'] = [
+#                         {'disease': self.class_names[i], 'confidence': float(scores[i])}
+#                         for i in classes
+#                     ]
+#                 if return_all:
+#                     result['scores'] = scores
+#                 results.append(result)
 
-#             return result
+#             return results
 
 #         except Exception as e:
 #             logger.error(f"Prediction error: {str(e)}")
-#             return {'error': str(e)}
+#             return [{'error': str(e)} for _ in image_paths]
+
+#     def predict(self, image_path: str, top_k: int = 1, return_all: bool = False) -> Dict:
+#         """Predict disease from image"""
+#         return self.predict_batch([image_path], top_k=top_k, return_all=return_all)[0]
+
+#     @staticmethod
+#     def to_json(result) -> bytes:
+#         """Serialize prediction results, including NumPy score arrays"""
+#         return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+
+#     @staticmethod
+#     def _onnx_path(model_path: str) -> str:
+#         """ONNX export stored next to the Keras model"""
+#         return os.path.splitext(model_path)[0] + '.onnx'
 
 #     def save_model(self, model_path: str):
-#         """Save the trained model"""
-#         self.model.save(model_path)
+#         """Save the trained model as a SavedModel directory, plus its ONNX export"""
+#         self.model.save(model_path, save_format='tf')
 #         logger.info(f"Model saved to {model_path}")
 
+#         onnx_path = self._onnx_path(model_path)
+#         self._to_onnx(onnx_path)
+#         logger.info(f"ONNX model saved to {onnx_path}")
+
 #     def load_model(self, model_path: str):
 #         """Load a trained model"""
 #         self.model = keras.models.load_model(model_path)
 #         logger.info(f"Model loaded from {model_path}")
 
+#         # Serve from the saved ONNX export when there is one
+#         onnx_path = self._onnx_path(model_path)
+#         self._init_session(onnx_path if os.path.exists(onnx_path) else None)
+
 # def main():
 #     """Main function for training"""
 #     # Example usage
@@ -181,7 +340,7 @@
 
 #     # Train the model (uncomment when dataset is available)
 #     # model.train('dataset/train', 'dataset/validation', epochs=10)
-#     # model.save_model('models/crop_disease_model.h5')
+#     # model.save_model('models/crop_disease_model')
 
 #     logger.info("Model ready for predictions")
 
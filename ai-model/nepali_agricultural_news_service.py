@@ -6,30 +6,40 @@ Automatically fetches, categorizes, and stores agricultural news from Nepali web
 
 import os
 import sys
+import atexit
 import json
-import uuid
+import shelve
+import asyncio
+import hashlib
+import threading
 import logging
-import requests
+import orjson
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
-import time
 import re
+from contextlib import contextmanager
+from functools import lru_cache
+from cachetools import TTLCache
 
 # Web scraping
-from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import aiohttp
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+from lxml import etree
 
 # Database
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 from sqlalchemy import create_engine, text
+import redis
 
 # AI/ML
-from transformers import pipeline
-import torch
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from optimum.pipelines import pipeline
+from transformers import AutoTokenizer
 
 # Scheduling
 from apscheduler.schedulers.blocking import BlockingScheduler
@@ -64,10 +74,34 @@ logger = logging.getLogger(__name__)
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
     'port': int(os.getenv('DB_PORT', 5432)),
-    'database': os.getenv('DB_NAME', 'agricultural_news_db'),
+    'dbname': os.getenv('DB_NAME', 'agricultural_news_db'),
     'user': os.getenv('DB_USER', 'postgres'),
     'password': os.getenv('DB_PASSWORD', 'your_password')
 }
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 4))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 32))
+DB_POOL_MAX_IDLE = int(os.getenv('DB_POOL_MAX_IDLE', 300))  # Seconds before idle connections above the minimum are closed
+
+# API Server Configuration
+API_WORKER_CONNECTIONS = int(os.getenv('API_WORKER_CONNECTIONS', 1000))  # Concurrent greenlets per gunicorn worker
+# Postgres connections shared by all API workers; keep below the server's
+# max_connections (default 100) with room for the pipeline and admin sessions
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 80))
+
+# API Request Limits
+NEWS_DEFAULT_LIMIT = 10
+NEWS_MAX_LIMIT = 200  # Upper bound on articles per /api/news response
+
+# Redis Cache Configuration
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 32))
+NEWS_CACHE_TTL = 300  # Seconds
+CATEGORIES_CACHE_TTL = 900  # Seconds
+CATEGORIES_CACHE_KEY = 'categories:all'
+LAST_MODIFIED_CACHE_KEY = 'news:last_modified'  # Under news:* so a pipeline run drops it
+LAST_MODIFIED_CACHE_TTL = 5  # Seconds
+CATEGORIES_LOCAL_TTL = 600  # Seconds each API worker keeps /api/categories in memory
+COMPRESSED_CACHE_TTL = 300  # Seconds; compressed bodies are also dropped with the news:* keys
 
 # Target Nepali Agricultural News Websites
 TARGET_URLS = [
@@ -93,6 +127,14 @@ TARGET_URLS = [
     }
 ]
 
+# Scraping Configuration
+MAX_REQUESTS_PER_HOST = 2
+REQUEST_DELAY = 1  # Seconds to wait before each request to a host
+REQUEST_TIMEOUT = 30
+REQUEST_RETRIES = 3
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_PAGE_BYTES = 2_000_000  # Listing pages larger than this are truncated
+
 # AI Model Configuration
 CATEGORIES = [
     'crop_pests',
@@ -106,6 +148,10 @@ CATEGORIES = [
     'organic_farming',
     'uncategorized'
 ]
+CATEGORIZER_MODEL = "valhalla/distilbart-mnli-12-3"  # Distilled zero-shot classification model
+CATEGORIZER_ONNX_DIR = os.getenv('CATEGORIZER_ONNX_DIR', 'models/distilbart-mnli-12-3-int8')
+CATEGORIZER_ONNX_FILE = "model_quantized.onnx"
+CATEGORY_CACHE_PATH = os.getenv('CATEGORY_CACHE_PATH', 'category_cache')  # Shelve file of past categorizations
 
 # Scheduling Configuration
 SCHEDULE_TIME = "06:00"  # Run daily at 6 AM
@@ -115,389 +161,666 @@ TIMEZONE = "Asia/Kathmandu"
 # DATABASE SETUP
 # =============================================================================
 
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Grows to max_size under load and shrinks back after max_idle;
+                # callers wait for a free connection when it is exhausted
+                _pool = ConnectionPool(
+                    kwargs=DB_CONFIG,
+                    min_size=DB_POOL_MIN,
+                    max_size=DB_POOL_MAX,
+                    max_idle=DB_POOL_MAX_IDLE,
+                    open=True
+                )
+                atexit.register(_pool.close)
+    return _pool
+
+@contextmanager
+def get_conn():
+    """Borrow a connection from the pool; committed on return, rolled back on error"""
+    with get_pool().connection() as conn:
+        yield conn
+
 def setup_database():
     """Create database tables if they don't exist"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        cursor = conn.cursor()
+        with get_conn() as conn:
+            cursor = conn.cursor()
 
-        # Create news table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS news (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                title VARCHAR(500) NOT NULL,
-                content TEXT,
-                image_url VARCHAR(1000),
-                source VARCHAR(100) NOT NULL,
-                publish_date TIMESTAMP,
-                category VARCHAR(50) DEFAULT 'uncategorized',
-                url VARCHAR(1000) UNIQUE NOT NULL,
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW()
-            );
-        """)
+            # Create news table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS news (
+                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                    title VARCHAR(500) NOT NULL,
+                    content TEXT,
+                    image_url VARCHAR(1000),
+                    source VARCHAR(100) NOT NULL,
+                    publish_date TIMESTAMP,
+                    category VARCHAR(50) DEFAULT 'uncategorized',
+                    url VARCHAR(1000) UNIQUE NOT NULL,
+                    is_active BOOLEAN DEFAULT TRUE,
+                    created_at TIMESTAMP DEFAULT NOW(),
+                    updated_at TIMESTAMP DEFAULT NOW()
+                );
+            """)
+
+            # Create news_category table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS news_category (
+                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                    title VARCHAR(500) NOT NULL,
+                    description TEXT,
+                    created_at TIMESTAMP DEFAULT NOW(),
+                    updated_at TIMESTAMP DEFAULT NOW()
+                );
+            """)
+
+            # Create index for better performance
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_news_url ON news(url);
+                CREATE INDEX IF NOT EXISTS idx_news_category ON news(category);
+                CREATE INDEX IF NOT EXISTS idx_news_publish_date ON news(publish_date);
+                CREATE INDEX IF NOT EXISTS idx_news_active_pubdate ON news(publish_date) WHERE is_active = TRUE;
+                CREATE INDEX IF NOT EXISTS idx_news_active_category_pubdate ON news(category, publish_date DESC) WHERE is_active = TRUE;
+                CREATE INDEX IF NOT EXISTS idx_news_updated_at ON news(updated_at);
+                DROP INDEX IF EXISTS idx_news_active_category;
+            """)
+
+            # Precomputed category counts for /api/categories, refreshed by the pipeline.
+            # The unique index is required for REFRESH ... CONCURRENTLY.
+            cursor.execute("""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS news_category_counts AS
+                    SELECT category, COUNT(*) AS count
+                    FROM news
+                    WHERE is_active = TRUE
+                    GROUP BY category;
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_news_category_counts_category ON news_category_counts(category);
+            """)
 
-        # Create news_category table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS news_category (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                title VARCHAR(500) NOT NULL,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW()
-            );
-        """)
+            conn.commit()
+            cursor.close()
 
-        # Create index for better performance
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_news_url ON news(url);
-            CREATE INDEX IF NOT EXISTS idx_news_category ON news(category);
-            CREATE INDEX IF NOT EXISTS idx_news_publish_date ON news(publish_date);
-        """)
-
-        conn.commit()
-        cursor.close()
-        conn.close()
         logger.info("✅ Database tables created successfully!")
 
     except Exception as e:
         logger.error(f"❌ Database setup failed: {e}")
         raise
 
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+# Short socket timeouts so a Redis outage degrades to cache misses quickly
+redis_client = redis.Redis(
+    connection_pool=redis.BlockingConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        socket_connect_timeout=1,
+        socket_timeout=1
+    )
+)
+
+def cache_get(key: str) -> Optional[Tuple[bytes, str]]:
+    """Read a cached (body, etag) pair; a Redis outage counts as a miss"""
+    try:
+        body, etag = redis_client.hmget(key, 'body', 'etag')
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+    if body is None or etag is None:
+        return None
+    return body, etag.decode('ascii')
+
+def cache_set(key: str, ttl: int, body: bytes, etag: str):
+    """Store a serialized response body and its ETag for ttl seconds"""
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hset(key, mapping={'body': body, 'etag': etag})
+        pipe.expire(key, ttl)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+class CompressedBodyCache:
+    """Flask-Compress cache backend that keeps compressed bodies in Redis
+
+    A None key means the body cannot be identified, so nothing is cached.
+    Flask-Compress calls set() after every get(), hits included; a hit is
+    remembered on flask.g so the body is not uploaded again.
+    """
+
+    def get(self, key: Optional[str]) -> Optional[bytes]:
+        if key is None:
+            return None
+        try:
+            value = redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+
+        if value is not None:
+            g.compressed_cache_hit = key
+        return value
+
+    def set(self, key: Optional[str], value: bytes):
+        if key is None or g.get('compressed_cache_hit') == key:
+            return
+        try:
+            redis_client.set(key, value, ex=COMPRESSED_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+# The categories payload is tiny and changes only when the pipeline runs,
+# so each process keeps a copy in memory in front of Redis
+categories_cache = TTLCache(maxsize=1, ttl=CATEGORIES_LOCAL_TTL)
+# Guards categories_cache (TTLCache is not thread-safe) and makes a miss
+# single-flight: concurrent callers wait for one recompute
+categories_cache_lock = threading.Lock()
+
+def invalidate_api_cache():
+    """Drop every cached API response"""
+    # Only reaches this process's copy; other workers expire theirs by TTL
+    with categories_cache_lock:
+        categories_cache.clear()
+    try:
+        keys = list(redis_client.scan_iter('news:*')) + [CATEGORIES_CACHE_KEY]
+        redis_client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Cache invalidation failed: {e}")
+
 # =============================================================================
 # WEB SCRAPING PIPELINE
 # =============================================================================
 
-def create_session():
-    """Create a requests session with retry strategy"""
-    session = requests.Session()
+def create_session() -> aiohttp.ClientSession:
+    """Create an aiohttp session with per-host connection limits"""
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_REQUESTS_PER_HOST)
 
-    # Configure retry strategy
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
+    # Set headers to mimic browser
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        headers={
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
     )
 
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+async def read_html_body(response: aiohttp.ClientResponse, url: str) -> Tuple[bytes, Optional[str]]:
+    """Stream an HTML body and its declared charset, skipping non-HTML responses and capping its size"""
+    content_type = response.headers.get('Content-Type', '')
+    if content_type and 'html' not in content_type:
+        raise ValueError(f"Unexpected content type {content_type!r} for {url}")
 
-    # Set headers to mimic browser
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    })
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        body.extend(chunk)
+        if len(body) > MAX_PAGE_BYTES:
+            logger.warning(f"Truncated {url} at {MAX_PAGE_BYTES} bytes")
+            break
+
+    return bytes(body), response.charset
 
-    return session
+async def fetch_page(session, url: str, semaphore: asyncio.Semaphore) -> Tuple[bytes, Optional[str]]:
+    """Fetch a page body and its charset, retrying transient failures with exponential backoff"""
+    for attempt in range(REQUEST_RETRIES + 1):
+        try:
+            async with semaphore:
+                # Be respectful - add delay between requests to the same host
+                await asyncio.sleep(REQUEST_DELAY)
+
+                async with session.get(url) as response:
+                    if response.status not in RETRY_STATUS_CODES or attempt == REQUEST_RETRIES:
+                        response.raise_for_status()
+                        return await read_html_body(response, url)
+
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == REQUEST_RETRIES:
+                raise
+
+        await asyncio.sleep(2 ** attempt)
+
+# Common Nepali date patterns, combined into one alternation scanned in a single pass.
+# Named groups let extract_date_from_text prefer them in this order, wherever they occur.
+DATE_PATTERN = re.compile(
+    r'(?P<iso>\d{4}-\d{2}-\d{2})'  # YYYY-MM-DD
+    r'|(?P<mdy>\d{2}/\d{2}/\d{4})'  # MM/DD/YYYY
+    r'|(?P<dmy>\d{2}-\d{2}-\d{4})'  # DD-MM-YYYY
+    r'|(?P<nepali>\d{1,2}\s+(?:Baisakh|Jestha|Asar|Shrawan|Bhadra|Ashoj|Kartik|Mangsir|Poush|Magh|Falgun|Chaitra)\s+\d{4})'  # Nepali months
+)
+DATE_PATTERN_PRIORITY = ('iso', 'mdy', 'dmy', 'nepali')
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching a whole CSS class token, like the `.name` selector"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Generic selectors for news sites, compiled once and tried in priority order
+NEWS_ITEM_XPATHS = [etree.XPath(xpath) for xpath in (
+    '//article',
+    f'//*[{_has_class("post")}]',
+    f'//*[{_has_class("news-item")}]',
+    f'//*[{_has_class("entry")}]',
+    f'//*[{_has_class("story")}]',
+    '//div[contains(@class, "news")]',
+    '//div[contains(@class, "article")]',
+    '//div[contains(@class, "post")]',
+)]
+TITLE_XPATHS = [etree.XPath(xpath) for xpath in (
+    './/h1', './/h2', './/h3',
+    f'.//*[{_has_class("title")}]',
+    f'.//*[{_has_class("headline")}]',
+)]
+CONTENT_XPATHS = [etree.XPath(xpath) for xpath in (
+    './/p',
+    f'.//*[{_has_class("excerpt")}]',
+    f'.//*[{_has_class("summary")}]',
+    f'.//*[{_has_class("content")}]',
+)]
+DATE_XPATHS = [etree.XPath(xpath) for xpath in (
+    './/time',
+    f'.//*[{_has_class("date")}]',
+    f'.//*[{_has_class("published")}]',
+    f'.//*[{_has_class("timestamp")}]',
+)]
+
+def _first_match(xpaths: List[etree.XPath], node):
+    """Return the first element matched by the highest-priority XPath"""
+    for xpath in xpaths:
+        matches = xpath(node)
+        if matches:
+            return matches[0]
+    return None
+
+def _stripped_text(elem) -> str:
+    """Element text with each text node stripped, like BeautifulSoup's get_text(strip=True)"""
+    return ''.join(piece.strip() for piece in elem.itertext())
+
+@lru_cache(maxsize=4096)
+def parse_date_string(date_str: str) -> datetime:
+    """Parse a matched date string; many articles share publish dates"""
+    return date_parser.parse(date_str)
 
 def extract_date_from_text(text: str) -> Optional[datetime]:
     """Extract date from text using various patterns"""
     if not text:
         return None
 
-    # Common Nepali date patterns
-    date_patterns = [
-        r'(\d{4}-\d{2}-\d{2})',  # YYYY-MM-DD
-        r'(\d{2}/\d{2}/\d{4})',  # MM/DD/YYYY
-        r'(\d{2}-\d{2}-\d{4})',  # DD-MM-YYYY
-        r'(\d{1,2}\s+(?:Baisakh|Jestha|Asar|Shrawan|Bhadra|Ashoj|Kartik|Mangsir|Poush|Magh|Falgun|Chaitra)\s+\d{4})',  # Nepali months
-    ]
+    # First match of each format; an ISO date outranks everything, so stop there
+    first_matches = {}
+    for match in DATE_PATTERN.finditer(text):
+        first_matches.setdefault(match.lastgroup, match.group(0))
+        if match.lastgroup == DATE_PATTERN_PRIORITY[0]:
+            break
 
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
-        if match:
+    for name in DATE_PATTERN_PRIORITY:
+        if name in first_matches:
             try:
-                date_str = match.group(1)
-                return date_parser.parse(date_str)
-            except:
+                return parse_date_string(first_matches[name])
+            except (ValueError, OverflowError):
                 continue
 
     return None
 
-def scrape_narc_news(session, base_url: str) -> List[Dict]:
-    """Scrape news from Nepal Agricultural Research Council"""
+def parse_narc_news(html: bytes, charset: Optional[str], base_url: str) -> List[Dict]:
+    """Parse news articles from a Nepal Agricultural Research Council page"""
     articles = []
-    try:
-        response = session.get(base_url, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+    # Only build the container elements that can hold news items
+    soup = BeautifulSoup(
+        html, 'lxml', from_encoding=charset,
+        parse_only=SoupStrainer(['article', 'div', 'main', 'section'])
+    )
 
-        # Find news articles (adjust selectors based on actual site structure)
-        news_items = soup.find_all('div', class_='news-item') or soup.find_all('article') or soup.find_all('div', class_='post')
+    # Find news articles (adjust selectors based on actual site structure)
+    news_items = soup.find_all('div', class_='news-item') or soup.find_all('article') or soup.find_all('div', class_='post')
 
-        for item in news_items[:10]:  # Limit to 10 articles
-            try:
-                # Extract title
-                title_elem = item.find('h2') or item.find('h3') or item.find('a')
-                title = title_elem.get_text(strip=True) if title_elem else "No title"
-
-                # Extract URL
-                link_elem = item.find('a')
-                url = urljoin(base_url, link_elem['href']) if link_elem and link_elem.get('href') else None
-
-                if not url:
-                    continue
-
-                # Extract content
-                content_elem = item.find('p') or item.find('div', class_='excerpt')
-                content = content_elem.get_text(strip=True) if content_elem else ""
-
-                # Extract image
-                img_elem = item.find('img')
-                image_url = urljoin(base_url, img_elem['src']) if img_elem and img_elem.get('src') else None
-
-                # Extract date
-                date_elem = item.find('time') or item.find('span', class_='date')
-                publish_date = None
-                if date_elem:
-                    publish_date = extract_date_from_text(date_elem.get_text())
-
-                if not publish_date:
-                    publish_date = datetime.now()
-
-                articles.append({
-                    'title': title,
-                    'content': content,
-                    'image_url': image_url,
-                    'source': 'Nepal Agricultural Research Council',
-                    'publish_date': publish_date,
-                    'url': url
-                })
+    for item in news_items[:10]:  # Limit to 10 articles
+        try:
+            # Extract title
+            title_elem = item.find('h2') or item.find('h3') or item.find('a')
+            title = title_elem.get_text(strip=True) if title_elem else "No title"
 
-            except Exception as e:
-                logger.warning(f"Error parsing article: {e}")
+            # Extract URL
+            link_elem = item.find('a')
+            url = urljoin(base_url, link_elem['href']) if link_elem and link_elem.get('href') else None
+
+            if not url:
                 continue
 
-    except Exception as e:
-        logger.error(f"Error scraping NARC: {e}")
+            # Extract content
+            content_elem = item.find('p') or item.find('div', class_='excerpt')
+            content = content_elem.get_text(strip=True) if content_elem else ""
+
+            # Extract image
+            img_elem = item.find('img')
+            image_url = urljoin(base_url, img_elem['src']) if img_elem and img_elem.get('src') else None
+
+            # Extract date
+            date_elem = item.find('time') or item.find('span', class_='date')
+            publish_date = None
+            if date_elem:
+                publish_date = extract_date_from_text(date_elem.get_text())
+
+            if not publish_date:
+                publish_date = datetime.now()
+
+            articles.append({
+                'title': title,
+                'content': content,
+                'image_url': image_url,
+                'source': 'Nepal Agricultural Research Council',
+                'publish_date': publish_date,
+                'url': url
+            })
+
+        except Exception as e:
+            logger.warning(f"Error parsing article: {e}")
+            continue
 
     return articles
 
-def scrape_generic_news(session, site_config: Dict) -> List[Dict]:
-    """Generic scraper for news sites"""
-    articles = []
+async def scrape_narc_news(session, base_url: str, semaphore: asyncio.Semaphore) -> List[Dict]:
+    """Scrape news from Nepal Agricultural Research Council"""
     try:
-        response = session.get(site_config['url'], timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Generic selectors for news sites
-        selectors = [
-            'article', '.post', '.news-item', '.entry', '.story',
-            'div[class*="news"]', 'div[class*="article"]', 'div[class*="post"]'
-        ]
-
-        news_items = []
-        for selector in selectors:
-            news_items = soup.select(selector)
-            if news_items:
-                break
-
-        for item in news_items[:10]:
-            try:
-                # Extract title
-                title_selectors = ['h1', 'h2', 'h3', '.title', '.headline']
-                title = "No title"
-                for selector in title_selectors:
-                    title_elem = item.select_one(selector)
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        break
+        html, charset = await fetch_page(session, base_url, semaphore)
+        # Parse in a worker thread so the event loop keeps downloading other sites
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, parse_narc_news, html, charset, base_url)
 
-                # Extract URL
-                link_elem = item.find('a')
-                url = urljoin(site_config['url'], link_elem['href']) if link_elem and link_elem.get('href') else None
+    except Exception as e:
+        logger.error(f"Error scraping NARC: {e}")
+        return []
 
-                if not url:
-                    continue
+def parse_generic_news(html: bytes, charset: Optional[str], site_config: Dict) -> List[Dict]:
+    """Generic parser for news site pages"""
+    articles = []
+    # libxml2 falls back to Latin-1 without a <meta charset>, which garbles
+    # Devanagari; use the HTTP charset, else detect it as BeautifulSoup does
+    encoding = charset or UnicodeDammit(html, is_html=True).original_encoding
+    tree = lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+
+    news_items = []
+    for xpath in NEWS_ITEM_XPATHS:
+        news_items = xpath(tree)
+        if news_items:
+            break
+
+    for item in news_items[:10]:
+        try:
+            # Extract title
+            title_elem = _first_match(TITLE_XPATHS, item)
+            title = _stripped_text(title_elem) if title_elem is not None else "No title"
+
+            # Extract URL
+            link_elem = item.find('.//a')
+            url = urljoin(site_config['url'], link_elem.get('href')) if link_elem is not None and link_elem.get('href') else None
+
+            if not url:
+                continue
 
-                # Extract content
-                content_selectors = ['p', '.excerpt', '.summary', '.content']
-                content = ""
-                for selector in content_selectors:
-                    content_elem = item.select_one(selector)
-                    if content_elem:
-                        content = content_elem.get_text(strip=True)
+            # Extract content
+            content_elem = _first_match(CONTENT_XPATHS, item)
+            content = _stripped_text(content_elem) if content_elem is not None else ""
+
+            # Extract image
+            img_elem = item.find('.//img')
+            image_url = urljoin(site_config['url'], img_elem.get('src')) if img_elem is not None and img_elem.get('src') else None
+
+            # Extract date
+            publish_date = datetime.now()
+            for xpath in DATE_XPATHS:
+                date_elems = xpath(item)
+                if date_elems:
+                    extracted_date = extract_date_from_text(date_elems[0].text_content())
+                    if extracted_date:
+                        publish_date = extracted_date
                         break
 
-                # Extract image
-                img_elem = item.find('img')
-                image_url = urljoin(site_config['url'], img_elem['src']) if img_elem and img_elem.get('src') else None
+            articles.append({
+                'title': title,
+                'content': content,
+                'image_url': image_url,
+                'source': site_config['name'],
+                'publish_date': publish_date,
+                'url': url
+            })
 
-                # Extract date
-                date_selectors = ['time', '.date', '.published', '.timestamp']
-                publish_date = datetime.now()
-                for selector in date_selectors:
-                    date_elem = item.select_one(selector)
-                    if date_elem:
-                        extracted_date = extract_date_from_text(date_elem.get_text())
-                        if extracted_date:
-                            publish_date = extracted_date
-                            break
-
-                articles.append({
-                    'title': title,
-                    'content': content,
-                    'image_url': image_url,
-                    'source': site_config['name'],
-                    'publish_date': publish_date,
-                    'url': url
-                })
+        except Exception as e:
+            logger.warning(f"Error parsing article from {site_config['name']}: {e}")
+            continue
 
-            except Exception as e:
-                logger.warning(f"Error parsing article from {site_config['name']}: {e}")
-                continue
+    return articles
+
+async def scrape_generic_news(session, site_config: Dict, semaphore: asyncio.Semaphore) -> List[Dict]:
+    """Generic scraper for news sites"""
+    try:
+        html, charset = await fetch_page(session, site_config['url'], semaphore)
+        # Parse in a worker thread so the event loop keeps downloading other sites
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, parse_generic_news, html, charset, site_config)
 
     except Exception as e:
         logger.error(f"Error scraping {site_config['name']}: {e}")
+        return []
 
-    return articles
-
-def scrape_all_sites() -> List[Dict]:
-    """Scrape all configured news sites"""
-    session = create_session()
-    all_articles = []
+async def scrape_site(session, site_config: Dict, semaphore: asyncio.Semaphore) -> List[Dict]:
+    """Scrape a single configured news site"""
+    logger.info(f"Scraping {site_config['name']}...")
 
-    for site_config in TARGET_URLS:
-        logger.info(f"Scraping {site_config['name']}...")
+    if site_config['name'] == 'Nepal Agricultural Research Council':
+        articles = await scrape_narc_news(session, site_config['url'], semaphore)
+    else:
+        articles = await scrape_generic_news(session, site_config, semaphore)
 
-        if site_config['name'] == 'Nepal Agricultural Research Council':
-            articles = scrape_narc_news(session, site_config['url'])
-        else:
-            articles = scrape_generic_news(session, site_config)
+    logger.info(f"Found {len(articles)} articles from {site_config['name']}")
+    return articles
 
-        all_articles.extend(articles)
-        logger.info(f"Found {len(articles)} articles from {site_config['name']}")
+async def scrape_all_sites_async() -> List[Dict]:
+    """Scrape all configured news sites concurrently"""
+    # One politeness semaphore per host
+    semaphores = {}
+    for site_config in TARGET_URLS:
+        host = urlparse(site_config['url']).netloc
+        semaphores.setdefault(host, asyncio.Semaphore(MAX_REQUESTS_PER_HOST))
 
-        # Be respectful - add delay between requests
-        time.sleep(2)
+    async with create_session() as session:
+        results = await asyncio.gather(*[
+            scrape_site(session, site_config, semaphores[urlparse(site_config['url']).netloc])
+            for site_config in TARGET_URLS
+        ])
 
+    all_articles = [article for articles in results for article in articles]
     logger.info(f"Total articles scraped: {len(all_articles)}")
     return all_articles
 
+def scrape_all_sites() -> List[Dict]:
+    """Scrape all configured news sites"""
+    return asyncio.run(scrape_all_sites_async())
+
 # =============================================================================
 # AI-DRIVEN CATEGORIZATION
 # =============================================================================
 
 class NewsCategorizer:
+    BATCH_SIZE = 16
+
     def __init__(self):
         """Initialize the news categorizer with a pre-trained model"""
+        # Define category descriptions for zero-shot classification
+        self.category_descriptions = {
+            'crop_pests': 'Information about crop diseases, pests, and plant health issues',
+            'market_prices': 'Agricultural market prices, commodity prices, and market trends',
+            'weather_advisory': 'Weather forecasts, climate information, and weather-related agricultural advice',
+            'policy_update': 'Government policies, regulations, and agricultural policy changes',
+            'technology_innovation': 'New agricultural technologies, innovations, and farming methods',
+            'fertilizer_seeds': 'Information about fertilizers, seeds, and agricultural inputs',
+            'irrigation_water': 'Irrigation systems, water management, and water-related agricultural topics',
+            'livestock_dairy': 'Livestock farming, dairy production, and animal husbandry',
+            'organic_farming': 'Organic farming practices, sustainable agriculture, and eco-friendly farming'
+        }
+        self.candidate_labels = list(self.category_descriptions.values())
+        self.label_categories = {description: category for category, description in self.category_descriptions.items()}
+
         try:
-            # Use a lightweight model for text classification
+            model, tokenizer = self._load_quantized_model()
             self.classifier = pipeline(
-                "text-classification",
-                model="facebook/bart-large-mnli",  # Zero-shot classification model
-                device=0 if torch.cuda.is_available() else -1
+                "zero-shot-classification",
+                model=model,
+                tokenizer=tokenizer,
+                accelerator="ort"
             )
             logger.info("✅ AI categorizer initialized successfully!")
         except Exception as e:
             logger.error(f"❌ Failed to initialize AI categorizer: {e}")
             self.classifier = None
 
-    def categorize_article(self, title: str, content: str) -> str:
-        """Categorize an article based on its title and content"""
-        if not self.classifier:
-            return "uncategorized"
+    def _load_quantized_model(self):
+        """Load the INT8 ONNX categorizer, exporting and quantizing it on first use"""
+        if not os.path.exists(os.path.join(CATEGORIZER_ONNX_DIR, CATEGORIZER_ONNX_FILE)):
+            logger.info(f"Exporting {CATEGORIZER_MODEL} to ONNX and quantizing to INT8...")
+            model = ORTModelForSequenceClassification.from_pretrained(CATEGORIZER_MODEL, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=CATEGORIZER_ONNX_DIR,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+            AutoTokenizer.from_pretrained(CATEGORIZER_MODEL).save_pretrained(CATEGORIZER_ONNX_DIR)
+
+        model = ORTModelForSequenceClassification.from_pretrained(CATEGORIZER_ONNX_DIR, file_name=CATEGORIZER_ONNX_FILE)
+        tokenizer = AutoTokenizer.from_pretrained(CATEGORIZER_ONNX_DIR)
+        return model, tokenizer
+
+    def _to_category(self, result: Dict) -> str:
+        """Map a zero-shot result back to a category name"""
+        best_score = result['scores'][0]
+        best_label = result['labels'][0]
+
+        # Only assign category if confidence is high enough
+        if best_score > 0.3:
+            return self.label_categories.get(best_label, "uncategorized")
+        return "uncategorized"
+
+    def _classify(self, texts: List[str]) -> List[str]:
+        """Run the zero-shot pipeline over a batch of texts"""
+        results = self.classifier(
+            texts,
+            self.candidate_labels,
+            batch_size=self.BATCH_SIZE,
+            multi_label=False
+        )
+        return [self._to_category(result) for result in results]
+
+    @staticmethod
+    def _cache_key(title: str, content: str) -> str:
+        """Cache key for an article's categorization input"""
+        data = f"{CATEGORIZER_MODEL}\0{title}\0{content[:1000]}".encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def categorize_articles(self, articles: List[Dict]) -> List[str]:
+        """Categorize articles based on their title and content, reusing cached results"""
+        if not self.classifier or not articles:
+            return ["uncategorized"] * len(articles)
 
         try:
-            # Combine title and content for classification
-            text = f"{title} {content}"[:1000]  # Limit text length
-
-            # Define category descriptions for zero-shot classification
-            category_descriptions = {
-                'crop_pests': 'Information about crop diseases, pests, and plant health issues',
-                'market_prices': 'Agricultural market prices, commodity prices, and market trends',
-                'weather_advisory': 'Weather forecasts, climate information, and weather-related agricultural advice',
-                'policy_update': 'Government policies, regulations, and agricultural policy changes',
-                'technology_innovation': 'New agricultural technologies, innovations, and farming methods',
-                'fertilizer_seeds': 'Information about fertilizers, seeds, and agricultural inputs',
-                'irrigation_water': 'Irrigation systems, water management, and water-related agricultural topics',
-                'livestock_dairy': 'Livestock farming, dairy production, and animal husbandry',
-                'organic_farming': 'Organic farming practices, sustainable agriculture, and eco-friendly farming'
-            }
-
-            # Perform zero-shot classification
-            candidate_labels = list(category_descriptions.values())
-            result = self.classifier(text, candidate_labels)
-
-            # Get the best matching category
-            best_score = result['scores'][0]
-            best_label = result['labels'][0]
-
-            # Map back to category name
-            for category, description in category_descriptions.items():
-                if description == best_label:
-                    # Only assign category if confidence is high enough
-                    if best_score > 0.3:
-                        return category
-                    else:
-                        return "uncategorized"
-
-            return "uncategorized"
+            keys = [self._cache_key(article['title'], article['content']) for article in articles]
+
+            with shelve.open(CATEGORY_CACHE_PATH) as cache:
+                categories = [cache.get(key) for key in keys]
+                misses = [i for i, category in enumerate(categories) if category is None]
+
+                if misses:
+                    # Combine title and content for classification
+                    texts = [f"{articles[i]['title']} {articles[i]['content']}"[:1000] for i in misses]  # Limit text length
+                    for i, category in zip(misses, self._classify(texts)):
+                        categories[i] = category
+                        cache[keys[i]] = category
+
+            logger.info(f"Categorized {len(misses)} articles, {len(articles) - len(misses)} from cache")
+            return categories
 
         except Exception as e:
-            logger.error(f"Error categorizing article: {e}")
-            return "uncategorized"
+            logger.error(f"Error categorizing articles: {e}")
+            return ["uncategorized"] * len(articles)
+
+    def categorize_article(self, title: str, content: str) -> str:
+        """Categorize an article based on its title and content"""
+        return self.categorize_articles([{'title': title, 'content': content}])[0]
 
 # =============================================================================
 # DATABASE OPERATIONS
 # =============================================================================
 
-def upsert_article(conn, article: Dict, category: str) -> bool:
-    """Insert or update article in database"""
-    try:
-        cursor = conn.cursor()
-
-        # Check if article already exists
-        cursor.execute("SELECT id FROM news WHERE url = %s", (article['url'],))
-        existing = cursor.fetchone()
-
-        if existing:
-            # Update existing article
-            cursor.execute("""
-                UPDATE news SET
-                    title = %s,
-                    content = %s,
-                    image_url = %s,
-                    source = %s,
-                    publish_date = %s,
-                    category = %s,
-                    is_active = TRUE,
-                    updated_at = NOW()
-                WHERE url = %s
-            """, (
-                article['title'],
-                article['content'],
-                article['image_url'],
-                article['source'],
-                article['publish_date'],
-                category,
-                article['url']
-            ))
-            logger.info(f"Updated article: {article['title']}")
-            return False  # Not a new article
-        else:
-            # Insert new article
-            cursor.execute("""
-                INSERT INTO news (id, title, content, image_url, source, publish_date, category, url, is_active)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, TRUE)
-            """, (
-                str(uuid.uuid4()),
-                article['title'],
-                article['content'],
-                article['image_url'],
-                article['source'],
-                article['publish_date'],
-                category,
-                article['url']
-            ))
-            logger.info(f"Inserted new article: {article['title']}")
-            return True  # New article
-
-    except Exception as e:
-        logger.error(f"Error upserting article: {e}")
-        return False
+# Date filters must compare the raw column against half-open bounds
+# (col >= start AND col < end). Wrapping the column, as in DATE(col) = ...
+# or EXTRACT(... FROM col), hides it from the publish_date indexes.
+
+def day_bounds(day) -> Tuple[datetime, datetime]:
+    """Half-open [start, end) timestamp range covering one calendar day"""
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+def upsert_articles(conn, categorized: List[Tuple[Dict, str]]) -> Tuple[int, int]:
+    """Insert or update a batch of (article, category) pairs in one statement
+
+    URLs must be unique within the batch, since ON CONFLICT cannot touch the
+    same row twice in one statement. Returns a (new, updated) count tuple.
+    """
+    if not categorized:
+        return 0, 0
+
+    # One array parameter per column, expanded with unnest so the whole batch
+    # stays a single statement
+    columns = list(zip(*(
+        (
+            article['title'],
+            article['content'],
+            article['image_url'],
+            article['source'],
+            article['publish_date'],
+            category,
+            article['url']
+        )
+        for article, category in categorized
+    )))
+
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO news (title, content, image_url, source, publish_date, category, url, is_active)
+        SELECT title, content, image_url, source, publish_date, category, url, TRUE
+        FROM unnest(
+            %s::text[], %s::text[], %s::text[], %s::text[], %s::timestamp[], %s::text[], %s::text[]
+        ) AS batch(title, content, image_url, source, publish_date, category, url)
+        ON CONFLICT (url) DO UPDATE SET
+            title = EXCLUDED.title,
+            content = EXCLUDED.content,
+            image_url = EXCLUDED.image_url,
+            source = EXCLUDED.source,
+            publish_date = EXCLUDED.publish_date,
+            category = EXCLUDED.category,
+            is_active = TRUE,
+            updated_at = NOW()
+        RETURNING (xmax = 0) AS inserted
+    """, [list(column) for column in columns])
+
+    results = cursor.fetchall()
+    new_count = sum(1 for (inserted,) in results if inserted)
+    logger.info(f"Upserted {len(results)} articles ({new_count} new)")
+    return new_count, len(results) - new_count
+
+def get_recently_updated_urls(conn, urls: List[str], hours: int = 6) -> set:
+    """Return the subset of URLs whose articles were refreshed in the last few hours"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT url FROM news
+        WHERE url = ANY(%s) AND updated_at > NOW() - %s * INTERVAL '1 hour'
+    """, (urls, hours))
+    return {row[0] for row in cursor.fetchall()}
 
 def deactivate_old_articles(conn):
     """Deactivate articles older than 7 days"""
@@ -516,6 +839,18 @@ def deactivate_old_articles(conn):
     except Exception as e:
         logger.error(f"Error deactivating old articles: {e}")
 
+def refresh_category_counts(conn):
+    """Recompute the category counts view without blocking readers"""
+    try:
+        # Runs in a savepoint so a failed refresh rolls back alone, not the
+        # ingest transaction it is part of
+        with conn.transaction(), conn.cursor() as cursor:
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY news_category_counts")
+        logger.info("Refreshed category counts")
+
+    except Exception as e:
+        logger.error(f"Error refreshing category counts: {e}")
+
 def get_summary_stats(conn) -> Dict:
     """Get summary statistics for the current run"""
     try:
@@ -537,11 +872,10 @@ def get_summary_stats(conn) -> Dict:
         total_active = cursor.fetchone()[0]
 
         # Articles from today
-        today = datetime.now().date()
         cursor.execute("""
             SELECT COUNT(*) FROM news
-            WHERE DATE(publish_date) = %s
-        """, (today,))
+            WHERE publish_date >= %s AND publish_date < %s
+        """, day_bounds(datetime.now().date()))
         today_count = cursor.fetchone()[0]
 
         return {
@@ -566,13 +900,11 @@ def run_news_pipeline():
     stats = {
         'new_articles': 0,
         'updated_articles': 0,
+        'skipped_articles': 0,
         'errors': 0
     }
 
     try:
-        # Setup database
-        setup_database()
-
         # Initialize AI categorizer
         categorizer = NewsCategorizer()
 
@@ -583,36 +915,46 @@ def run_news_pipeline():
             logger.warning("No articles found!")
             return
 
-        # Connect to database
-        conn = psycopg2.connect(**DB_CONFIG)
+        # Drop duplicate URLs from overlapping sources, keeping the last one
+        articles = list({article['url']: article for article in articles}.values())
 
-        # Process each article
-        for article in articles:
-            try:
-                # Categorize article
-                category = categorizer.categorize_article(article['title'], article['content'])
+        # Skip articles that a recent run already refreshed
+        with get_conn() as conn:
+            recent_urls = get_recently_updated_urls(conn, [article['url'] for article in articles])
+        stats['skipped_articles'] = len(recent_urls)
+        articles = [article for article in articles if article['url'] not in recent_urls]
 
-                # Store in database
-                is_new = upsert_article(conn, article, category)
+        # Categorize all articles in batches
+        categories = categorizer.categorize_articles(articles)
+        categorized = list(zip(articles, categories))
 
-                if is_new:
-                    stats['new_articles'] += 1
-                else:
-                    stats['updated_articles'] += 1
+        # Borrow a pooled connection
+        with get_conn() as conn:
+            # Store all articles in a single round-trip
+            try:
+                new_count, updated_count = upsert_articles(conn, categorized)
+                stats['new_articles'] += new_count
+                stats['updated_articles'] += updated_count
 
             except Exception as e:
-                logger.error(f"Error processing article: {e}")
-                stats['errors'] += 1
+                logger.error(f"Error upserting articles: {e}")
+                conn.rollback()
+                stats['errors'] += len(categorized)
+
+            # Deactivate old articles
+            deactivate_old_articles(conn)
+
+            # Refresh the precomputed category counts
+            refresh_category_counts(conn)
 
-        # Deactivate old articles
-        deactivate_old_articles(conn)
+            # Get summary statistics
+            summary_stats = get_summary_stats(conn)
 
-        # Get summary statistics
-        summary_stats = get_summary_stats(conn)
+            # Commit before the connection goes back to the pool
+            conn.commit()
 
-        # Commit and close
-        conn.commit()
-        conn.close()
+        # Cached API responses are stale once new articles are stored
+        invalidate_api_cache()
 
         # Log summary
         end_time = datetime.now()
@@ -624,6 +966,7 @@ def run_news_pipeline():
         logger.info(f"⏱️ Duration: {duration}")
         logger.info(f"📰 New articles: {stats['new_articles']}")
         logger.info(f"🔄 Updated articles: {stats['updated_articles']}")
+        logger.info(f"⏭️ Skipped recently refreshed articles: {stats['skipped_articles']}")
         logger.info(f"❌ Errors: {stats['errors']}")
         logger.info(f"📈 Total active articles: {summary_stats.get('total_active', 0)}")
         logger.info(f"📅 Today's articles: {summary_stats.get('today_count', 0)}")
@@ -661,99 +1004,301 @@ def setup_scheduler():
 # REST API (Optional)
 # =============================================================================
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, abort, g, jsonify, request
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 
-app = Flask(__name__)
+# Bodies are always UTF-8; say so instead of leaving clients to assume it
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
 
-@app.route('/api/news', methods=['GET'])
-def get_news():
-    """Get latest active news articles"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() uses its C encoder
+
+    orjson keeps insertion order and never sorts keys, so Flask's
+    sort_keys setting does not apply.
+    """
 
-        # Get query parameters
-        category = request.args.get('category')
-        limit = int(request.args.get('limit', 10))
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=str).decode('utf-8')
 
-        # Build query
-        query = """
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        # Skip the bytes -> str -> bytes round-trip of the default implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=str), content_type=JSON_CONTENT_TYPE)
+
+app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+def compressed_cache_key(req) -> Optional[str]:
+    """Cache key for a compressed body: the body's ETag plus the encoding Flask-Compress will use"""
+    etag = g.get('response_etag')
+    if etag is None:
+        return None
+    encoding = compress._choose_compress_algorithm(req.headers.get('Accept-Encoding', ''))
+    return f"news:gz:{encoding}:{etag}"
+
+# Compress JSON bodies for clients that accept it, reusing compressed bodies from Redis
+app.config['COMPRESS_MIN_SIZE'] = 512
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_CACHE_BACKEND'] = CompressedBodyCache
+app.config['COMPRESS_CACHE_KEY'] = compressed_cache_key
+compress = Compress(app)
+
+# Each query returns the complete /api/news response body as JSON text built
+# by Postgres. They run with prepare=True, so each connection plans them once.
+NEWS_RESPONSE_JSON = """
+        SELECT json_build_object(
+            'success', TRUE,
+            'count', COUNT(*),
+            'articles', COALESCE(json_agg(t ORDER BY t.publish_date DESC), '[]'::json)
+        )::text
+        FROM (
+            SELECT id, title, content, image_url, source, publish_date, category, url
+            FROM news
+            WHERE {where}
+            ORDER BY publish_date DESC LIMIT {limit}
+        ) t
+"""
+NEWS_BY_CATEGORY_SQL = NEWS_RESPONSE_JSON.format(where="is_active = TRUE AND category = %s", limit="%s")
+NEWS_ALL_SQL = NEWS_RESPONSE_JSON.format(where="is_active = TRUE", limit="%s")
+
+# Just the articles array, for /api/home
+HOME_ARTICLES_SQL = """
+        SELECT COALESCE(json_agg(t ORDER BY t.publish_date DESC), '[]'::json)::text
+        FROM (
             SELECT id, title, content, image_url, source, publish_date, category, url
             FROM news
             WHERE is_active = TRUE
-        """
-        params = []
-
-        if category:
-            query += " AND category = %s"
-            params.append(category)
-
-        query += " ORDER BY publish_date DESC LIMIT %s"
-        params.append(limit)
-
-        cursor.execute(query, params)
-        articles = cursor.fetchall()
-
-        # Convert to list of dicts
-        result = []
-        for article in articles:
-            result.append({
-                'id': str(article['id']),
-                'title': article['title'],
-                'content': article['content'],
-                'image_url': article['image_url'],
-                'source': article['source'],
-                'publish_date': article['publish_date'].isoformat() if article['publish_date'] else None,
-                'category': article['category'],
-                'url': article['url']
-            })
+            ORDER BY publish_date DESC LIMIT %s
+        ) t
+"""
 
-        cursor.close()
-        conn.close()
+CATEGORY_COUNTS_SQL = """
+        SELECT category, count
+        FROM news_category_counts
+        ORDER BY count DESC
+"""
 
-        return jsonify({
-            'success': True,
-            'count': len(result),
-            'articles': result
-        })
+def parse_limit(default: int = NEWS_DEFAULT_LIMIT, cap: int = NEWS_MAX_LIMIT) -> int:
+    """Read the ``limit`` query parameter, clamped to 1..cap; 400 when it is not a number"""
+    try:
+        return max(1, min(int(request.args.get('limit', default)), cap))
+    except (TypeError, ValueError):
+        abort(400, 'limit must be an integer')
+
+def parse_category() -> Optional[str]:
+    """Read the ``category`` query parameter; 400 when it is not a known category"""
+    category = request.args.get('category')
+    if category and category not in CATEGORIES:
+        abort(400, f"unknown category: {category}")
+    return category or None
+
+@app.errorhandler(400)
+def bad_request(e):
+    """Report invalid query parameters in the API's JSON error shape"""
+    return jsonify({
+        'success': False,
+        'error': e.description
+    }), 400
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag for a serialized response body"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def etag_matches(etag: str) -> bool:
+    """Whether If-None-Match names this body, with or without Flask-Compress's ":<encoding>" suffix"""
+    if_none_match = request.if_none_match
+    # If-None-Match uses weak comparison; proxies such as nginx gzip weaken ETags
+    return if_none_match.star_tag or any(
+        tag.split(':', 1)[0] == etag for tag in if_none_match.as_set(include_weak=True)
+    )
 
-    except Exception as e:
-        logger.error(f"API error: {e}")
+def news_last_modified() -> Optional[datetime]:
+    """Time of the latest change to the news table, cached in Redis for a few seconds
+
+    Uses updated_at rather than publish_date, so updates and deactivations
+    count as changes too.
+    """
+    try:
+        cached_epoch = redis_client.get(LAST_MODIFIED_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for {LAST_MODIFIED_CACHE_KEY}: {e}")
+        cached_epoch = None
+
+    if cached_epoch is not None:
+        epoch = int(cached_epoch)
+    else:
+        # The naive timestamps were written by NOW() in the session time zone
+        with get_conn() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT EXTRACT(EPOCH FROM MAX(updated_at)::timestamptz)::bigint FROM news")
+            epoch = cursor.fetchone()[0]
+        if epoch is None:
+            return None
+
+        try:
+            redis_client.set(LAST_MODIFIED_CACHE_KEY, epoch, ex=LAST_MODIFIED_CACHE_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"Cache write failed for {LAST_MODIFIED_CACHE_KEY}: {e}")
+
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+def not_modified_since(last_modified: Optional[datetime]) -> bool:
+    """Whether If-Modified-Since shows the client is current; If-None-Match takes precedence"""
+    if last_modified is None or request.if_none_match or request.if_modified_since is None:
+        return False
+    return last_modified <= request.if_modified_since
+
+def not_modified_response(last_modified: datetime) -> Response:
+    """Empty 304 answering a conditional GET"""
+    response = Response(status=304)
+    response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+def compressed_etag(etag: str, body: bytes) -> str:
+    """The ETag Flask-Compress would send for this body to this client"""
+    encoding = compress._choose_compress_algorithm(request.headers.get('Accept-Encoding', ''))
+    if encoding is None or len(body) < app.config['COMPRESS_MIN_SIZE']:
+        return etag
+    return f"{etag}:{encoding}"
+
+def json_response(body: bytes, etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Build a JSON response, answering 304 when the client already has this body"""
+    if etag_matches(etag):
+        # Flask-Compress skips 304s, so add the ":<encoding>" suffix the 200 would carry
+        response = Response(status=304)
+        response.set_etag(compressed_etag(etag, body))
+    else:
+        response = Response(body, content_type=JSON_CONTENT_TYPE)
+        response.set_etag(etag)
+
+    # Lets compressed_cache_key tie the compressed copy to this exact body
+    g.response_etag = etag
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+@app.route('/api/news', methods=['GET'])
+def get_news():
+    """Get latest active news articles"""
+    # Validate query parameters outside the try so a 400 is not reported as a 500
+    category = parse_category()
+    limit = parse_limit()
+
+    try:
+        # A client polling with If-Modified-Since is answered before any query
+        last_modified = news_last_modified()
+        if not_modified_since(last_modified):
+            return not_modified_response(last_modified)
+
+        # Serve the already-serialized payload when it is cached
+        cache_key = f"news:{category or '_'}:{limit}"
+        cached = cache_get(cache_key)
+        if cached is not None:
+            return json_response(*cached, last_modified)
+
+        # Postgres serializes the whole response; no rows pass through Python
+        sql, params = (NEWS_BY_CATEGORY_SQL, (category, limit)) if category else (NEWS_ALL_SQL, (limit,))
+        with get_conn() as conn, conn.cursor() as cursor:
+            cursor.execute(sql, params, prepare=True)
+            body = cursor.fetchone()[0].encode('utf-8')
+
+        etag = compute_etag(body)
+        cache_set(cache_key, NEWS_CACHE_TTL, body, etag)
+        return json_response(body, etag, last_modified)
+
+    except Exception:
+        # Details stay in the log; clients get a fixed body
+        logger.exception('API error for %s', request.endpoint)
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': 'internal'
         }), 500
 
+def compute_categories() -> Tuple[bytes, str]:
+    """Serialized /api/categories body and its ETag, kept in memory for CATEGORIES_LOCAL_TTL"""
+    with categories_cache_lock:
+        response = categories_cache.get(CATEGORIES_CACHE_KEY)
+        if response is None:
+            response = categories_cache[CATEGORIES_CACHE_KEY] = load_categories()
+        return response
+
+def load_categories() -> Tuple[bytes, str]:
+    """Serialized /api/categories body and its ETag, from Redis or the database"""
+    cached_response = cache_get(CATEGORIES_CACHE_KEY)
+    if cached_response is not None:
+        return cached_response
+
+    with get_conn() as conn, conn.cursor(row_factory=dict_row) as cursor:
+        cursor.execute(CATEGORY_COUNTS_SQL)
+        categories = cursor.fetchall()
+
+    body = orjson.dumps({
+        'success': True,
+        'categories': categories
+    })
+    etag = compute_etag(body)
+    cache_set(CATEGORIES_CACHE_KEY, CATEGORIES_CACHE_TTL, body, etag)
+    return body, etag
+
 @app.route('/api/categories', methods=['GET'])
 def get_categories():
     """Get available categories with counts"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT category, COUNT(*) as count
-            FROM news
-            WHERE is_active = TRUE
-            GROUP BY category
-            ORDER BY count DESC
-        """)
+        return json_response(*compute_categories())
 
-        categories = [{'category': row[0], 'count': row[1]} for row in cursor.fetchall()]
+    except Exception:
+        # Details stay in the log; clients get a fixed body
+        logger.exception('API error for %s', request.endpoint)
+        return jsonify({
+            'success': False,
+            'error': 'internal'
+        }), 500
 
-        cursor.close()
-        conn.close()
+@app.route('/api/home', methods=['GET'])
+def get_home():
+    """Get the latest news and the category counts in one response"""
+    limit = parse_limit()
 
-        return jsonify({
+    try:
+        last_modified = news_last_modified()
+        if not_modified_since(last_modified):
+            return not_modified_response(last_modified)
+
+        cache_key = f"news:home:{limit}"
+        cached = cache_get(cache_key)
+        if cached is not None:
+            return json_response(*cached, last_modified)
+
+        # Both queries go out in one pipeline, so they share a single round-trip
+        with get_conn() as conn, conn.pipeline():
+            articles_cursor = conn.execute(HOME_ARTICLES_SQL, (limit,), prepare=True)
+            categories_cursor = conn.cursor(row_factory=dict_row)
+            categories_cursor.execute(CATEGORY_COUNTS_SQL)
+
+            articles = articles_cursor.fetchone()[0]
+            categories = categories_cursor.fetchall()
+
+        # The articles array is already JSON text; embed it without re-parsing
+        body = orjson.dumps({
             'success': True,
+            'articles': orjson.Fragment(articles),
             'categories': categories
         })
+        etag = compute_etag(body)
+        cache_set(cache_key, NEWS_CACHE_TTL, body, etag)
+        return json_response(body, etag, last_modified)
 
-    except Exception as e:
-        logger.error(f"API error: {e}")
+    except Exception:
+        # Details stay in the log; clients get a fixed body
+        logger.exception('API error for %s', request.endpoint)
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': 'internal'
         }), 500
 
 # =============================================================================
@@ -768,9 +1313,13 @@ if __name__ == "__main__":
     parser.add_argument('--start-scheduler', action='store_true', help='Start the scheduler')
     parser.add_argument('--start-api', action='store_true', help='Start the REST API')
     parser.add_argument('--api-port', type=int, default=5000, help='API port (default: 5000)')
+    parser.add_argument('--api-workers', type=int, default=os.cpu_count(), help='Number of gunicorn workers (default: CPU count)')
 
     args = parser.parse_args()
 
+    # Create tables once at startup rather than on every pipeline run
+    setup_database()
+
     if args.run_now:
         # Run pipeline immediately
         run_news_pipeline()
@@ -782,9 +1331,24 @@ if __name__ == "__main__":
         scheduler.start()
 
     elif args.start_api:
-        # Start the REST API
-        logger.info(f"🌐 Starting REST API on port {args.api_port}...")
-        app.run(host='0.0.0.0', port=args.api_port, debug=False)
+        # Start the REST API under gunicorn with gevent workers
+        logger.info(f"🌐 Starting REST API on port {args.api_port} with {args.api_workers} workers...")
+
+        # Each worker gets its own pool; together they stay within DB_MAX_CONNECTIONS
+        worker_pool_max = max(1, DB_MAX_CONNECTIONS // args.api_workers)
+        os.environ.setdefault('DB_POOL_MAX', str(worker_pool_max))
+        os.environ.setdefault('DB_POOL_MIN', str(min(DB_POOL_MIN, worker_pool_max)))
+
+        module_dir, module_file = os.path.split(os.path.abspath(__file__))
+        os.execvp('gunicorn', [
+            'gunicorn',
+            '--worker-class', 'gevent',
+            '--workers', str(args.api_workers),
+            '--worker-connections', str(API_WORKER_CONNECTIONS),
+            '--bind', f'0.0.0.0:{args.api_port}',
+            '--chdir', module_dir,
+            f'{os.path.splitext(module_file)[0]}:app'
+        ])
 
     else:
         # Default: run pipeline immediately